@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+"""
+Phishing Analyzer Soak Test
+Replays the data/email_samples_* corpora against a long-lived PhishingAnalyzer
+for a fixed duration and watches for latency drift and memory growth
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ML_BACKEND_DIR = PROJECT_ROOT / "ml_backend"
+DATA_DIR = PROJECT_ROOT / "data"
+RESULTS_DIR = DATA_DIR / "results"
+
+
+def load_corpus(corpus_dirs, limit=None):
+    """Load .eml samples from the given folders, skipping duplicate file names"""
+    emails = []
+    seen = set()
+    for corpus_dir in corpus_dirs:
+        for path in sorted(Path(corpus_dir).glob("*.eml")):
+            if path.name in seen:
+                continue
+            seen.add(path.name)
+            emails.append(path.read_text(encoding='utf-8', errors='replace'))
+            if limit and len(emails) >= limit:
+                return emails
+    return emails
+
+
+def default_corpus_dirs():
+    """All data/email_samples_* folders"""
+    return sorted(p for p in DATA_DIR.glob("email_samples_*") if p.is_dir())
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None if it can't be measured"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def memory_stats():
+    """Current RSS and tracemalloc usage (tracemalloc only if tracing)"""
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    return {'rss_bytes': current_rss_bytes(), 'traced_bytes': traced}
+
+
+def top_allocation_growth(baseline, limit=10):
+    """Allocation sites that grew the most since the baseline snapshot"""
+    if baseline is None or not tracemalloc.is_tracing():
+        return None
+    stats = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+    return [str(stat) for stat in stats[:limit]]
+
+
+def is_error(result):
+    """The analyzer reports failures in its result instead of raising"""
+    return not isinstance(result, dict) or 'error' in result
+
+
+def create_analyzer():
+    """Import and build the real analyzer (loads the model)"""
+    sys.path.insert(0, str(ML_BACKEND_DIR))
+    from analyzer import PhishingAnalyzer
+    return PhishingAnalyzer()
+
+
+class InProcessBackend:
+    """Scores emails on an analyzer living in this process"""
+
+    name = 'in-process'
+
+    def __init__(self, analyzer, trace_memory=False):
+        self.analyzer = analyzer
+        self.baseline = None
+        if trace_memory:
+            # Started after the model is loaded so only scoring allocations are traced
+            tracemalloc.start(25)
+
+    def analyze(self, email_text):
+        return self.analyzer.analyze(email_text)
+
+    def memory_stats(self):
+        return memory_stats()
+
+    def mark_baseline(self):
+        if tracemalloc.is_tracing():
+            self.baseline = tracemalloc.take_snapshot()
+
+    def top_growth(self):
+        return top_allocation_growth(self.baseline)
+
+    def close(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def _worker_main(conn, trace_memory):
+    """Local worker process: owns the analyzer and answers requests over a pipe"""
+    # Ctrl+C reaches the whole process group; the parent decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    analyzer = create_analyzer()
+    if trace_memory:
+        tracemalloc.start(25)
+    baseline = None
+    conn.send('ready')
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        command, payload = message
+        if command == 'analyze':
+            try:
+                conn.send(('ok', analyzer.analyze(payload)))
+            except Exception as e:
+                conn.send(('exception', str(e)))
+        elif command == 'stats':
+            conn.send(('ok', memory_stats()))
+        elif command == 'baseline':
+            if tracemalloc.is_tracing():
+                baseline = tracemalloc.take_snapshot()
+            conn.send(('ok', None))
+        elif command == 'top_growth':
+            conn.send(('ok', top_allocation_growth(baseline)))
+    conn.close()
+
+
+class WorkerDied(RuntimeError):
+    """The worker process exited while the soak test was talking to it"""
+
+    def __init__(self, exit_code):
+        super().__init__(f"Worker process died (exit code {exit_code})")
+        self.exit_code = exit_code
+
+
+class WorkerBackend:
+    """Scores emails on an analyzer in a separate long-lived local process
+
+    Requests are serialised over a single pipe, so concurrency above 1 only
+    adds queueing in front of the worker.
+    """
+
+    name = 'local worker'
+
+    def __init__(self, trace_memory=False, startup_timeout=600):
+        ctx = multiprocessing.get_context('spawn')
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, trace_memory), daemon=True)
+        self.process.start()
+        # Drop our copy of the child's end so a dead worker shows up as EOF
+        child_conn.close()
+        self.lock = threading.Lock()
+        self.dead = False
+
+        deadline = time.monotonic() + startup_timeout
+        while not self.conn.poll(0.5):
+            if not self.process.is_alive():
+                self._fail_startup("exited before it was ready")
+            if time.monotonic() > deadline:
+                self.process.terminate()
+                self._fail_startup(f"was not ready after {startup_timeout}s")
+        try:
+            ready = self.conn.recv()
+        except (EOFError, OSError):
+            self._fail_startup("exited before it was ready")
+        if ready != 'ready':
+            self._fail_startup(f"sent {ready!r} instead of 'ready'")
+
+    def _fail_startup(self, reason):
+        self.process.join(timeout=5)
+        self.conn.close()
+        raise RuntimeError(f"Worker process {reason} (exit code {self.process.exitcode})")
+
+    def _died(self):
+        self.dead = True
+        self.process.join(timeout=5)
+        return WorkerDied(self.process.exitcode)
+
+    def _request(self, command, payload=None):
+        with self.lock:
+            if self.dead:
+                raise WorkerDied(self.process.exitcode)
+            try:
+                self.conn.send((command, payload))
+                status, value = self.conn.recv()
+            except (EOFError, OSError):
+                raise self._died() from None
+        if status != 'ok':
+            raise RuntimeError(value)
+        return value
+
+    def analyze(self, email_text):
+        return self._request('analyze', email_text)
+
+    def memory_stats(self):
+        return self._request('stats')
+
+    def mark_baseline(self):
+        # Snapshots stay in the worker; only the formatted diff crosses the pipe
+        self._request('baseline')
+
+    def top_growth(self):
+        return self._request('top_growth')
+
+    def close(self):
+        # Don't wait on the lock: a hung request may still be holding it
+        if not self.dead and self.process.is_alive() and self.lock.acquire(timeout=5):
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            finally:
+                self.lock.release()
+            self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class Recorder:
+    """Thread-safe collector of per-request outcomes, drained once per window"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+
+    def record(self, latency_s, ok):
+        with self.lock:
+            self.latencies.append(latency_s)
+            if not ok:
+                self.errors += 1
+
+    def drain(self):
+        with self.lock:
+            latencies, errors = self.latencies, self.errors
+            self.latencies, self.errors = [], 0
+        return latencies, errors
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_window(index, elapsed_s, window_s, latencies, errors, memory):
+    """Build the stats row for one time window"""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    to_ms = lambda v: v * 1000 if v is not None else None
+    return {
+        'window': index,
+        'elapsed_s': round(elapsed_s, 1),
+        'duration_s': round(window_s, 3),
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'throughput_rps': count / window_s if window_s > 0 else 0.0,
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p95_ms': to_ms(percentile(latencies, 95)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'max_ms': to_ms(latencies[-1]) if latencies else None,
+        'rss_mb': memory['rss_bytes'] / 1024 ** 2 if memory['rss_bytes'] is not None else None,
+        'traced_mb': memory['traced_bytes'] / 1024 ** 2 if memory['traced_bytes'] is not None else None,
+    }
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def _slope_per_hour(points):
+    """Least-squares slope of (elapsed_s, value) points, in units per hour"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return 0.0
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov / var_x * 3600
+
+
+def check_memory_growth(windows, key, max_growth_mb, min_monotonic):
+    """Flag steady growth of a memory series across the measured windows"""
+    points = [(w['elapsed_s'], w[key]) for w in windows if w[key] is not None]
+    if not points:
+        return {'checked': False, 'reason': 'not measured'}
+    if len(points) < 3:
+        return {'checked': False, 'reason': 'not enough samples'}
+    values = [v for _, v in points]
+    steps = [b - a for a, b in zip(values, values[1:])]
+    monotonic = sum(1 for s in steps if s >= 0) / len(steps)
+    growth = values[-1] - values[0]
+    return {
+        'checked': True,
+        'start_mb': values[0],
+        'end_mb': values[-1],
+        'growth_mb': growth,
+        'slope_mb_per_hour': _slope_per_hour(points),
+        'monotonic_fraction': monotonic,
+        'flagged': growth > max_growth_mb and monotonic >= min_monotonic,
+    }
+
+
+def check_latency_drift(windows, max_drift):
+    """Compare the median p95 of the last third of windows against the first third
+
+    A full window in which no request completed is a stall and is flagged on
+    its own, since it has no p95 to compare.
+    """
+    stalled = [w['window'] for w in windows if w['requests'] == 0 and not w.get('partial')]
+    # A window cut short by a worker crash is left to the run check
+    p95s = [w['p95_ms'] for w in windows if w['p95_ms'] is not None and not w.get('partial')]
+    if len(p95s) < 3:
+        if stalled:
+            return {'checked': True, 'stalled_windows': stalled, 'flagged': True}
+        return {'checked': False, 'reason': 'not enough samples'}
+    third = max(1, len(p95s) // 3)
+    baseline = _median(p95s[:third])
+    recent = _median(p95s[-third:])
+    ratio = recent / baseline if baseline > 0 else 1.0
+    return {
+        'checked': True,
+        'baseline_p95_ms': baseline,
+        'recent_p95_ms': recent,
+        'drift_ratio': ratio,
+        'stalled_windows': stalled,
+        'flagged': ratio > max_drift or bool(stalled),
+    }
+
+
+def run_soak(backend, emails, duration_s, window_s, concurrency=1, rate=None, warmup_s=0.0,
+             shutdown_timeout=30.0):
+    """Drive the backend for warmup_s + duration_s and return (windows, outcome)
+
+    With rate set, requests are issued open-loop at that many per second and
+    latency is measured from each request's scheduled start, so queueing
+    behind a slow analyzer shows up in the numbers. Without it, `concurrency`
+    threads score emails back-to-back. The backend's memory baseline is
+    marked when warmup ends.
+
+    The run stops early if the worker dies, on Ctrl+C, or on an unexpected
+    error; the windows collected so far are still returned and `outcome`
+    says why the run ended.
+    """
+    recorder = Recorder()
+    stop = threading.Event()
+    counter = {'next': 0}
+    counter_lock = threading.Lock()
+    crash = {}
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def next_email():
+        with counter_lock:
+            i = counter['next']
+            counter['next'] += 1
+        return emails[i % len(emails)]
+
+    def worker_died(e):
+        with counter_lock:
+            if not crash:
+                crash.update(exit_code=e.exit_code, elapsed_s=round(time.perf_counter() - start, 1))
+        stop.set()
+
+    def score(email_text, started):
+        try:
+            ok = not is_error(backend.analyze(email_text))
+        except WorkerDied as e:
+            worker_died(e)
+            return
+        except Exception as e:
+            print(f"❌ Request failed: {e}", file=sys.stderr)
+            ok = False
+        recorder.record(time.perf_counter() - started, ok)
+
+    def closed_loop():
+        while not stop.is_set():
+            score(next_email(), time.perf_counter())
+
+    def scheduled_task(email_text, scheduled):
+        try:
+            score(email_text, scheduled)
+        finally:
+            slots.release()
+
+    def open_loop():
+        interval = 1.0 / rate
+        i = 0
+        while not stop.is_set():
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                break
+            # Block rather than queue unboundedly; the backlog still counts
+            # against latency because timing starts at the scheduled time
+            while not slots.acquire(timeout=0.5):
+                if stop.is_set():
+                    return
+            email_text = next_email()
+            threading.Thread(target=scheduled_task, args=(email_text, scheduled), daemon=True).start()
+            i += 1
+
+    def sample_memory():
+        try:
+            return backend.memory_stats()
+        except WorkerDied as e:
+            worker_died(e)
+            return {'rss_bytes': None, 'traced_bytes': None}
+
+    start = time.perf_counter()
+    if rate:
+        drivers = [threading.Thread(target=open_loop, daemon=True)]
+    else:
+        drivers = [threading.Thread(target=closed_loop, daemon=True) for _ in range(concurrency)]
+    for driver in drivers:
+        driver.start()
+
+    windows = []
+    outcome = {'status': 'completed'}
+    warmup_end = start + warmup_s
+    deadline = warmup_end + duration_s
+    boundary = start
+    try:
+        if warmup_s <= 0:
+            backend.mark_baseline()
+        while boundary < deadline:
+            # Windows never straddle the end of warmup
+            in_warmup = boundary < warmup_end
+            previous = boundary
+            boundary = min(boundary + window_s, warmup_end if in_warmup else deadline)
+            # Wakes early if the worker dies
+            stop.wait(max(0.0, boundary - time.perf_counter()))
+            now = time.perf_counter()
+            latencies, errors = recorder.drain()
+            memory = sample_memory()
+            row = summarize_window(len(windows), now - start, min(now, boundary) - previous,
+                                   latencies, errors, memory)
+            row['warmup'] = in_warmup
+            if crash:
+                row['partial'] = True
+                row['worker_died'] = dict(crash)
+            windows.append(row)
+            print_window(row)
+            if crash:
+                break
+            if in_warmup and boundary >= warmup_end:
+                backend.mark_baseline()
+    except WorkerDied as e:
+        worker_died(e)
+    except KeyboardInterrupt:
+        outcome = {'status': 'interrupted', 'detail': 'Interrupted by user'}
+    except Exception as e:
+        outcome = {'status': 'error', 'detail': f"{type(e).__name__}: {e}"}
+    finally:
+        stop.set()
+        # Bounded so one hung analyze() call can't keep the harness alive
+        join_deadline = time.monotonic() + shutdown_timeout
+        for driver in drivers:
+            driver.join(timeout=max(0.0, join_deadline - time.monotonic()))
+        in_flight = 0
+        if rate:
+            for _ in range(concurrency):
+                if slots.acquire(timeout=max(0.0, join_deadline - time.monotonic())):
+                    continue
+                in_flight += 1
+        unfinished = sum(driver.is_alive() for driver in drivers) + in_flight
+
+    if crash and outcome['status'] != 'interrupted':
+        outcome = {'status': 'worker_died', 'detail': f"Worker process died (exit code {crash['exit_code']})",
+                   **crash}
+    outcome.setdefault('elapsed_s', round(time.perf_counter() - start, 1))
+    outcome['unfinished_requests'] = unfinished
+    return windows, outcome
+
+
+def fmt(value, spec='.1f'):
+    return format(value, spec) if value is not None else '-'
+
+
+def print_window(w):
+    """One progress line per window"""
+    tag = ' (warmup)' if w.get('warmup') else ''
+    print(
+        f"[{w['elapsed_s']:>7.1f}s] {w['requests']:>5} req  "
+        f"{w['throughput_rps']:>6.1f} rps  "
+        f"p50 {fmt(w['p50_ms']):>7}ms  p95 {fmt(w['p95_ms']):>7}ms  "
+        f"p99 {fmt(w['p99_ms']):>7}ms  max {fmt(w['max_ms']):>7}ms  "
+        f"err {w['error_rate']:.1%}  rss {fmt(w['rss_mb'])}MB  "
+        f"traced {fmt(w['traced_mb'], '.2f')}MB{tag}",
+        flush=True
+    )
+
+
+def build_report(windows, outcome, args, backend_name, corpus_size, top_allocations):
+    """Aggregate the windows and run the regression checks"""
+    measured = [w for w in windows if not w.get('warmup')]
+    total = sum(w['requests'] for w in measured)
+    errors = sum(w['errors'] for w in measured)
+    elapsed = sum(w['duration_s'] for w in measured)
+
+    checks = {
+        'rss_growth': check_memory_growth(measured, 'rss_mb', args.max_rss_growth_mb, args.min_monotonic),
+        'traced_growth': check_memory_growth(measured, 'traced_mb', args.max_traced_growth_mb, args.min_monotonic),
+        'latency_drift': check_latency_drift(measured, args.max_latency_drift),
+    }
+    error_rate = errors / total if total else 0.0
+    checks['error_rate'] = {
+        'checked': total > 0,
+        'error_rate': error_rate,
+        'flagged': error_rate > args.max_error_rate,
+    }
+    # An interrupted run is incomplete but not itself a regression
+    checks['run'] = {
+        'checked': True,
+        'status': outcome['status'],
+        'flagged': outcome['status'] in ('worker_died', 'error') or outcome['unfinished_requests'] > 0,
+    }
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'backend': backend_name,
+        'corpus_size': corpus_size,
+        'complete': outcome['status'] == 'completed',
+        'outcome': outcome,
+        'config': {
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'window_s': args.window,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+        },
+        'totals': {
+            'requests': total,
+            'errors': errors,
+            'error_rate': error_rate,
+            'throughput_rps': total / elapsed if elapsed else 0.0,
+        },
+        'checks': checks,
+        'passed': not any(c.get('flagged') for c in checks.values()),
+        'top_allocations': top_allocations,
+        'windows': windows,
+    }
+
+
+def print_report(report):
+    """Print the soak test summary"""
+    totals = report['totals']
+    checks = report['checks']
+    print()
+    print("=" * 70)
+    print("  🔥 SOAK TEST REPORT")
+    print("=" * 70)
+    print()
+    print(f"🧠 Backend: {report['backend']}")
+    print(f"📧 Corpus: {report['corpus_size']} emails")
+    print(f"📨 Requests: {totals['requests']} ({totals['throughput_rps']:.1f} rps)")
+    print(f"❌ Errors: {totals['errors']} ({totals['error_rate']:.2%})")
+    outcome = report['outcome']
+    if not report['complete']:
+        print(f"🛑 Run stopped early at {outcome['elapsed_s']:.1f}s: {outcome['detail']}")
+    if outcome['unfinished_requests']:
+        print(f"⏳ {outcome['unfinished_requests']} request(s) still running at shutdown")
+    print()
+
+    def status(check):
+        if not check.get('checked'):
+            return f"⚪ SKIPPED ({check.get('reason', 'not measured')})"
+        return "🚨 FLAGGED" if check['flagged'] else "✅ OK"
+
+    for key, label in (('rss_growth', 'RSS'), ('traced_growth', 'tracemalloc')):
+        check = checks[key]
+        print(f"💾 {label} growth: {status(check)}")
+        if check.get('checked'):
+            print(f"   {check['start_mb']:.1f}MB → {check['end_mb']:.1f}MB "
+                  f"({check['growth_mb']:+.1f}MB, {check['slope_mb_per_hour']:+.1f}MB/h, "
+                  f"{check['monotonic_fraction']:.0%} of windows non-decreasing)")
+
+    drift = checks['latency_drift']
+    print(f"⏱️  Latency drift: {status(drift)}")
+    if drift.get('checked'):
+        if 'drift_ratio' in drift:
+            print(f"   p95 {drift['baseline_p95_ms']:.1f}ms → {drift['recent_p95_ms']:.1f}ms "
+                  f"(x{drift['drift_ratio']:.2f})")
+        if drift['stalled_windows']:
+            print(f"   No requests completed in window(s): "
+                  f"{', '.join(str(i) for i in drift['stalled_windows'])}")
+
+    print(f"⚠️  Error rate: {status(checks['error_rate'])}")
+    print(f"🏁 Run: {status(checks['run'])} ({checks['run']['status']})")
+
+    if report['top_allocations']:
+        print()
+        print("🔍 Top allocation growth since warmup:")
+        for line in report['top_allocations']:
+            print(f"   {line}")
+
+    print()
+    print("=" * 70)
+    if not report['passed']:
+        print("  🚨 REGRESSION DETECTED")
+    elif not report['complete']:
+        print("  ⚠️  INCOMPLETE (no regression in the windows collected)")
+    else:
+        print("  ✅ PASSED")
+    print("=" * 70)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test PhishingAnalyzer under sustained load")
+    parser.add_argument('--corpus', nargs='+', type=Path,
+                        help="Folders of .eml samples (default: all data/email_samples_*)")
+    parser.add_argument('--limit', type=int, help="Maximum number of emails to load")
+    parser.add_argument('--duration', type=float, default=600, help="Measured run time in seconds")
+    parser.add_argument('--warmup', type=float, default=30, help="Seconds excluded from checks")
+    parser.add_argument('--window', type=float, default=10, help="Seconds per stats window")
+    parser.add_argument('--concurrency', type=int, default=1, help="Parallel requests in flight")
+    parser.add_argument('--rate', type=float, help="Target requests/second (open-loop); "
+                                                   "default is back-to-back requests")
+    parser.add_argument('--worker', action='store_true',
+                        help="Run the analyzer in a separate local worker process")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Track Python allocations (adds overhead)")
+    parser.add_argument('--max-rss-growth-mb', type=float, default=50)
+    parser.add_argument('--max-traced-growth-mb', type=float, default=10)
+    parser.add_argument('--min-monotonic', type=float, default=0.8,
+                        help="Share of non-decreasing windows for growth to count as a leak")
+    parser.add_argument('--max-latency-drift', type=float, default=1.5,
+                        help="Allowed ratio of late p95 to early p95; a window with "
+                             "no completed requests is always flagged as a stall")
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--output', type=Path, help="JSON report path "
+                                                    "(default: data/results/soak_test_<timestamp>.json)")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    if args.window <= 0 or args.duration <= 0:
+        parser.error("--window and --duration must be positive")
+    return args
+
+
+def main(argv=None):
+    """CLI entry point"""
+    args = parse_args(argv)
+
+    corpus_dirs = args.corpus or default_corpus_dirs()
+    emails = load_corpus(corpus_dirs, args.limit)
+    if not emails:
+        print(f"❌ No .eml files found in: {', '.join(str(d) for d in corpus_dirs)}")
+        return 1
+    print(f"📁 Loaded {len(emails)} emails from {len(corpus_dirs)} folder(s)")
+
+    if args.worker:
+        try:
+            backend = WorkerBackend(trace_memory=args.tracemalloc)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+    else:
+        backend = InProcessBackend(create_analyzer(), trace_memory=args.tracemalloc)
+
+    mode = f"{args.rate} rps open-loop" if args.rate else "closed-loop"
+    print(f"🔥 Soaking {backend.name} analyzer for {args.duration:.0f}s "
+          f"(+{args.warmup:.0f}s warmup), {mode}, concurrency {args.concurrency}")
+    print()
+
+    try:
+        windows, outcome = run_soak(backend, emails, args.duration, args.window,
+                                    args.concurrency, args.rate, args.warmup)
+        top_allocations = None
+        if outcome['status'] != 'worker_died':
+            try:
+                top_allocations = backend.top_growth()
+            except WorkerDied:
+                pass
+    finally:
+        backend.close()
+
+    report = build_report(windows, outcome, args, backend.name, len(emails), top_allocations)
+    print_report(report)
+
+    output = args.output or RESULTS_DIR / f"soak_test_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {output}")
+
+    if not report['passed']:
+        return 1
+    return 0 if report['complete'] else 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())